@@ -19,21 +19,68 @@ Version: 2.0.0
 """
 
 import os
-from flask import Flask, render_template, redirect, url_for, flash, session, request, jsonify, make_response
+from flask import Flask, render_template, redirect, url_for, flash, session, request, jsonify, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_talisman import Talisman
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_compress import Compress
+from werkzeug.security import check_password_hash as check_legacy_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from datetime import datetime, timedelta
 import requests
-import csv
-from io import StringIO
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from itertools import chain, islice
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import secrets
-from sqlalchemy import text
+import sqlite3
+import hashlib
+import redis
+import orjson
+import threading
+import time
+from types import SimpleNamespace
+from functools import lru_cache, wraps
+from sqlalchemy import select, literal, insert, update, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes responses with orjson.
+    
+    Used by jsonify() for all AJAX endpoints. Calls with extra keyword
+    arguments (such as the session serializer's separators) fall back to
+    the standard library implementation.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Deployment mode - read once at startup
+IS_PRODUCTION = os.environ.get('FLASK_ENV') == 'production'
 
 # Security Configuration
 # Generate secure secret key if not provided
@@ -41,20 +88,33 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', secrets.token_hex(32))
 # Database connection - defaults to SQLite for development
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///tautulli_exporter.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    # Pooled SQLite connections are handed between gunicorn threads
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'check_same_thread': False}}
+else:
+    # Size the pool for threaded workers; pre-ping and recycle drop stale connections
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+        'pool_timeout': 10
+    }
 
 # CSRF Protection
 app.config['WTF_CSRF_ENABLED'] = True
 app.config['WTF_CSRF_TIME_LIMIT'] = None  # No time limit for CSRF tokens
 
 # Session Security - secure cookies in production only
-app.config['SESSION_COOKIE_SECURE'] = os.environ.get('FLASK_ENV') == 'production'
+app.config['SESSION_COOKIE_SECURE'] = IS_PRODUCTION
 app.config['SESSION_COOKIE_HTTPONLY'] = True  # Prevent XSS access to session cookies
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'  # CSRF protection
 # Default session timeout: 8 hours (480 minutes)
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(minutes=int(os.environ.get('SESSION_TIMEOUT', 480)))
 
-# Security Headers
-if os.environ.get('SECURITY_HEADERS', 'true').lower() == 'true':
+# Security Headers - read once at startup; Talisman adds them to every response
+SECURITY_HEADERS_ENABLED = os.environ.get('SECURITY_HEADERS', 'true').lower() == 'true'
+if SECURITY_HEADERS_ENABLED:
     # Content Security Policy - allows Bootstrap CSS/JS from CDN
     csp = {
         'default-src': "'self'",  # Only allow resources from same origin by default
@@ -67,29 +127,111 @@ if os.environ.get('SECURITY_HEADERS', 'true').lower() == 'true':
     Talisman(app, 
              force_https=False,  # Set to True when using HTTPS in production
              strict_transport_security=True,
-             content_security_policy=csp)
+             content_security_policy=csp,
+             frame_options='DENY',  # X-Frame-Options: DENY
+             referrer_policy='strict-origin-when-cross-origin',
+             x_content_type_options=True,  # X-Content-Type-Options: nosniff
+             x_xss_protection=True)  # X-XSS-Protection: 1; mode=block
+
+# Response Compression - Brotli preferred, gzip fallback, for pages and JSON
+# Streamed CSV exports are left uncompressed: Flask-Compress buffers streams
+# in full before compressing, which would defeat streaming large exports
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json']
+app.config['COMPRESS_MIN_SIZE'] = 500
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
 
 # Rate Limiting with Redis storage
 redis_url = os.environ.get('REDIS_URL', 'redis://redis:6379/0')
+# Limits are applied per route rather than globally, so only endpoints that
+# need protection pay for a Redis round-trip on each request. Every route that
+# calls out to Tautulli, other than the Redis-cached /get_users, has a limit
+RATE_LIMIT = f"{os.environ.get('RATE_LIMIT', 100)} per minute"  # Default: 100 requests/minute
 limiter = Limiter(
     app,
     key_func=get_remote_address,  # Rate limit by client IP address
-    default_limits=[f"{os.environ.get('RATE_LIMIT', 100)} per minute"],  # Default: 100 requests/minute
+    strategy='fixed-window',  # Cheapest strategy: one counter per key and window
     storage_uri=redis_url
 )
 
+# Redis cache for rarely-changing Tautulli lookups (shares the limiter's Redis)
+# Disabled when the limiter uses a non-Redis backend such as memory://
+if redis_url.startswith(('redis://', 'rediss://', 'unix://')):
+    redis_cache = redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2)
+else:
+    redis_cache = None
+USERS_CACHE_TTL = int(os.environ.get('USERS_CACHE_TTL', 300))  # Seconds
+USERS_CACHE_STALE_TTL = 86400  # Seconds a stale list is kept for ETag revalidation
+
 # Logging Configuration
-if os.environ.get('FLASK_ENV') == 'production':
+if IS_PRODUCTION:
     logging.basicConfig(level=logging.INFO)
     app.logger.info('Tautulli History Exporter starting in production mode')
 
+# Tautulli history paging - Tautulli typically limits responses to around
+# 1000 items per request, and pages beyond the first are fetched concurrently
+HISTORY_PAGE_SIZE = 1000
+HISTORY_FETCH_WORKERS = int(os.environ.get('HISTORY_FETCH_WORKERS', 8))
+RECENT_HISTORY_LENGTH = 25  # Items shown on the dashboard before a query is run
+
+# Health check - a successful database probe is reused for this many seconds
+HEALTH_CHECK_INTERVAL = 1.0
+_last_health_ok = float('-inf')
+
+# CSV export layout - rows are written and streamed in batches
+CSV_HEADERS = ['Date', 'User', 'Title', 'Media Type', 'Duration (min)', 'Percent Complete', 'Status', 'IP Address']
+CSV_HEADER_LINE = ','.join(CSV_HEADERS) + '\r\n'
+CSV_LINE_FORMAT = '{},{},{},{},{},{}%,{},{}\r\n'
+CSV_BATCH_SIZE = 500
+WATCHED_STATUS_LABELS = {1: 'Finished', 0: 'Stopped'}  # Any other status is 'Unknown'
+
+# Shared HTTP session for Tautulli API calls - keep-alive and connection
+# pooling avoid a new TCP/TLS handshake on every request and history page
+_tautulli_session = requests.Session()
+_tautulli_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,  # Enough for concurrent history page fetches
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+)
+_tautulli_session.mount('http://', _tautulli_adapter)
+_tautulli_session.mount('https://', _tautulli_adapter)
+_tautulli_session.headers['Connection'] = 'keep-alive'
+
+# In-process cache of the single Configuration row
+CONFIG_CACHE_TTL = int(os.environ.get('CONFIG_CACHE_TTL', 30))  # Seconds
+_config_cache = None
+_config_cache_expires = 0.0
+_config_lock = threading.Lock()
+
+# Password hashing - Argon2id verifies faster than pbkdf2 at equivalent
+# strength and releases the GIL while hashing. The parameters are the OWASP
+# minimum (19 MiB, 2 passes, 1 lane); hashes made with other parameters are
+# upgraded on the next successful login
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
 # Initialize database
 db = SQLAlchemy(app)
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Enable write-ahead logging on new SQLite connections.
+    
+    WAL lets readers proceed while a write is in progress, and
+    synchronous=NORMAL is safe in WAL mode while avoiding an fsync on
+    every commit. Connections to other databases are left untouched.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
 # Database Models
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), unique=True, nullable=False)
+    username = db.Column(db.String(80), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(120), nullable=False)
     must_change_password = db.Column(db.Boolean, default=True)
     role = db.Column(db.String(20), default='user')  # 'admin' or 'user'
@@ -99,22 +241,28 @@ class User(db.Model):
     
     def get_allowed_users(self):
         """Get list of allowed Tautulli usernames for this user"""
-        import json
         try:
-            return json.loads(self.allowed_tautulli_users)
+            return orjson.loads(self.allowed_tautulli_users)
         except:
             return []
     
     def set_allowed_users(self, usernames):
         """Set allowed Tautulli usernames for this user"""
-        import json
-        self.allowed_tautulli_users = json.dumps(usernames)
+        self.allowed_tautulli_users = orjson.dumps(usernames).decode()
     
     def is_admin(self):
         """Check if user is an admin"""
         return self.role == 'admin'
 
+# Columns loaded for the logged-in user on every request (everything except
+# the password hash and audit timestamps)
+SESSION_USER_COLUMNS = (User.username, User.role, User.must_change_password,
+                        User.allowed_tautulli_users, User.is_active)
+
 class Configuration(db.Model):
+    # Single-row table: the configuration always lives at id 1
+    __table_args__ = (db.CheckConstraint('id = 1', name='configuration_single_row'),)
+    
     id = db.Column(db.Integer, primary_key=True)
     tautulli_url = db.Column(db.String(255), nullable=True)
     api_key = db.Column(db.String(255), nullable=True)
@@ -131,16 +279,62 @@ def is_logged_in():
     """
     return 'user_id' in session
 
+def hash_password(password):
+    """
+    Hash a password for storage using Argon2id.
+    
+    Args:
+        password (str): The plaintext password
+        
+    Returns:
+        str: Encoded Argon2 hash including its parameters and salt
+    """
+    return password_hasher.hash(password)
+
+def verify_password(password_hash, password):
+    """
+    Check a password against a stored hash.
+    
+    Accepts Argon2 hashes as well as legacy Werkzeug (pbkdf2/scrypt) hashes
+    created before the switch to Argon2.
+    
+    Args:
+        password_hash (str): The stored password hash
+        password (str): The plaintext password to check
+        
+    Returns:
+        bool: True if the password matches
+    """
+    if password_hash.startswith('$argon2'):
+        try:
+            return password_hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_legacy_password_hash(password_hash, password)
+
+def password_needs_rehash(password_hash):
+    """
+    Check whether a stored hash should be replaced on next successful login.
+    
+    Args:
+        password_hash (str): The stored password hash
+        
+    Returns:
+        bool: True for legacy Werkzeug hashes or outdated Argon2 parameters
+    """
+    if not password_hash.startswith('$argon2'):
+        return True
+    return password_hasher.check_needs_rehash(password_hash)
+
 def require_admin(f):
     """Decorator to require admin role for route access"""
-    from functools import wraps
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if not is_logged_in():
             flash('Please log in to access this page.', 'error')
             return redirect(url_for('login'))
         
-        user = User.query.get(session['user_id'])
+        user = get_current_user()
         if not user or not user.is_admin():
             flash('Admin access required.', 'error')
             return redirect(url_for('dashboard'))
@@ -149,30 +343,197 @@ def require_admin(f):
     return decorated_function
 
 def get_current_user():
-    """Get the current logged-in user object"""
+    """
+    Get the current logged-in user object.
+    
+    Loads only the columns needed for permission checks and templates, so
+    the password hash is not fetched on every page view.
+    """
     if is_logged_in():
-        return User.query.get(session['user_id'])
+        return db.session.get(User, session['user_id'], options=[load_only(*SESSION_USER_COLUMNS)])
     return None
 
+def filter_allowed_users(user, tautulli_users):
+    """
+    Filter Tautulli users down to those the given user may access.
+    
+    Args:
+        user (User): The logged-in user
+        tautulli_users (list): User dictionaries from the Tautulli API
+        
+    Returns:
+        list: All users for admins, otherwise only the allowed users
+    """
+    # Admin can see all users
+    if user.is_admin():
+        return tautulli_users
+    
+    # Regular user can only see allowed users
+    allowed_usernames = user.get_allowed_users()
+    return [u for u in tautulli_users if u.get('friendly_name') in allowed_usernames]
+
+def filter_allowed_history(user, history):
+    """
+    Filter history items down to those the given user may access.
+    
+    Args:
+        user (User): The logged-in user
+        history (list): History item dictionaries from the Tautulli API
+        
+    Returns:
+        list: All items for admins, otherwise only items for allowed users
+    """
+    if user.is_admin():
+        return history
+    
+    allowed_usernames = user.get_allowed_users()
+    return [item for item in history if item.get('friendly_name') in allowed_usernames]
+
+def can_access_tautulli_user(user, url, api_key, tautulli_user_id):
+    """
+    Check whether the given user may view a Tautulli user's history.
+    
+    Non-admin users are checked against the (Redis-cached) Tautulli user
+    list filtered by filter_allowed_users, so history requests apply the
+    same permission rule as the user dropdown.
+    
+    Args:
+        user (User): The logged-in user
+        url (str): The Tautulli server URL
+        api_key (str): The Tautulli API key
+        tautulli_user_id (str): The requested Tautulli user ID
+        
+    Returns:
+        bool: True if the user may access this Tautulli user's history
+    """
+    if user.is_admin():
+        return True
+    
+    allowed_users = filter_allowed_users(user, get_tautulli_users(url, api_key))
+    return any(str(u.get('user_id')) == str(tautulli_user_id) for u in allowed_users)
+
 @app.context_processor
 def inject_user():
     """Make current user available in all templates"""
     return dict(current_user=get_current_user())
 
-def get_configuration():
+def load_configuration():
     """
-    Get or create the application configuration from database.
+    Get or create the application configuration row from database.
+    
+    Always queries the database, so use this when the configuration is
+    about to be modified. Read-only callers should use get_configuration().
     
     Returns:
         Configuration: The configuration object containing Tautulli URL and API key
     """
-    config = Configuration.query.first()
+    config = db.session.get(Configuration, 1)
     if not config:
-        config = Configuration()
+        config = Configuration(id=1)
         db.session.add(config)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker created the row first
+            db.session.rollback()
+            config = db.session.get(Configuration, 1)
     return config
 
+def cache_configuration(config):
+    """
+    Store a detached snapshot of the configuration in the process cache.
+    
+    An incomplete configuration (no URL or API key) is not cached, so that
+    once an admin saves it every worker picks it up on the next request
+    instead of after CONFIG_CACHE_TTL.
+    
+    Args:
+        config (Configuration): The configuration row to cache
+        
+    Returns:
+        SimpleNamespace: The cached snapshot
+    """
+    global _config_cache, _config_cache_expires
+    
+    snapshot = SimpleNamespace(
+        id=config.id,
+        tautulli_url=config.tautulli_url,
+        api_key=config.api_key,
+        created_at=config.created_at,
+        updated_at=config.updated_at
+    )
+    complete = bool(snapshot.tautulli_url and snapshot.api_key)
+    with _config_lock:
+        _config_cache = snapshot if complete else None
+        _config_cache_expires = time.monotonic() + CONFIG_CACHE_TTL
+    return snapshot
+
+def get_configuration():
+    """
+    Get the application configuration, cached in process memory.
+    
+    The single configuration row only changes from the configuration form,
+    so it is read from the database at most once every CONFIG_CACHE_TTL
+    seconds. The TTL lets other gunicorn workers pick up changes.
+    
+    Returns:
+        SimpleNamespace: Read-only snapshot with tautulli_url and api_key
+    """
+    with _config_lock:
+        if _config_cache is not None and time.monotonic() < _config_cache_expires:
+            return _config_cache
+    return cache_configuration(load_configuration())
+
+class TautulliClient:
+    """
+    Tautulli API access bound to one server URL and API key.
+    
+    The API endpoint and base query parameters are built once per server
+    rather than on every request. Use get_tautulli_client() to obtain a
+    shared instance.
+    """
+    
+    def __init__(self, url, api_key):
+        self.api_url = url.rstrip('/') + '/api/v2'
+        self._base_params = {'apikey': api_key}
+        self.session = _tautulli_session
+    
+    def get(self, cmd, params=None, headers=None, timeout=10):
+        """
+        Call a Tautulli API command.
+        
+        Args:
+            cmd (str): The API command, e.g. get_history
+            params (dict, optional): Additional query parameters
+            headers (dict, optional): Additional request headers
+            timeout (int, optional): Request timeout in seconds. Defaults to 10
+            
+        Returns:
+            requests.Response: The raw API response
+        """
+        query = self._base_params | {'cmd': cmd}
+        if params:
+            query.update(params)
+        return self.session.get(self.api_url, params=query, headers=headers, timeout=timeout)
+
+@lru_cache(maxsize=4)
+def get_tautulli_client(url, api_key):
+    """
+    Get the shared TautulliClient for a server URL and API key.
+    
+    Cached because the configured server rarely changes while history
+    exports issue one request per page. The cache is cleared when the
+    configuration is updated.
+    
+    Args:
+        url (str): The Tautulli server URL, with or without a trailing slash
+        api_key (str): The Tautulli API key
+        
+    Returns:
+        TautulliClient: Client for this server
+    """
+    return TautulliClient(url, api_key)
+
 def test_tautulli_connection(url, api_key):
     """
     Test connection to Tautulli API by attempting to get server info.
@@ -185,32 +546,84 @@ def test_tautulli_connection(url, api_key):
         tuple: (success: bool, message: str) indicating connection status and result message
     """
     try:
-        if not url.endswith('/'):
-            url += '/'
-        
-        test_url = f"{url}api/v2"
-        params = {
-            'apikey': api_key,
-            'cmd': 'get_server_info'
-        }
+        response = get_tautulli_client(url, api_key).get('get_server_info', timeout=10)
+        api_response = orjson.loads(response.content).get('response') or {}
         
-        response = requests.get(test_url, params=params, timeout=10)
-        data = response.json()
-        
-        if data.get('response', {}).get('result') == 'success':
+        if api_response.get('result') == 'success':
             return True, "Connection successful!"
         else:
-            return False, "API returned error: " + str(data.get('response', {}).get('message', 'Unknown error'))
+            return False, "API returned error: " + str(api_response.get('message', 'Unknown error'))
     
     except requests.exceptions.RequestException as e:
         return False, f"Connection failed: {str(e)}"
     except Exception as e:
         return False, f"Error: {str(e)}"
 
+def _users_cache_key(url, api_key):
+    """
+    Build the Redis key under which a Tautulli server's user list is cached.
+    
+    Args:
+        url (str): The Tautulli server URL
+        api_key (str): The Tautulli API key
+        
+    Returns:
+        str: Cache key unique to this URL and API key
+    """
+    digest = hashlib.sha1(f"{url}{api_key}".encode()).hexdigest()
+    return f"tautulli:users:{digest}"
+
+def invalidate_users_cache(url, api_key):
+    """
+    Drop the cached Tautulli user list for a server, ignoring Redis errors.
+    
+    Args:
+        url (str): The Tautulli server URL
+        api_key (str): The Tautulli API key
+    """
+    if redis_cache is None or not url or not api_key:
+        return
+    cache_key = _users_cache_key(url, api_key)
+    try:
+        redis_cache.delete(cache_key, f"{cache_key}:etag", f"{cache_key}:fresh")
+    except redis.RedisError as e:
+        app.logger.warning(f"Error invalidating user cache: {e}")
+
+def _store_users_cache(cache_key, body, etag):
+    """
+    Store a Tautulli user list and its ETag in Redis, ignoring Redis errors.
+    
+    The list is kept for USERS_CACHE_STALE_TTL seconds so it can be
+    revalidated with If-None-Match, and marked fresh for USERS_CACHE_TTL.
+    
+    Args:
+        cache_key (str): Key from _users_cache_key()
+        body (str or bytes): JSON-encoded user list
+        etag (str or None): ETag returned by Tautulli, if any
+    """
+    if redis_cache is None:
+        return
+    try:
+        pipe = redis_cache.pipeline(transaction=False)
+        pipe.setex(cache_key, USERS_CACHE_STALE_TTL, body)
+        pipe.setex(f"{cache_key}:fresh", USERS_CACHE_TTL, 1)
+        if etag:
+            pipe.setex(f"{cache_key}:etag", USERS_CACHE_STALE_TTL, etag)
+        else:
+            pipe.delete(f"{cache_key}:etag")
+        pipe.execute()
+    except redis.RedisError as e:
+        app.logger.warning(f"Error writing user cache: {e}")
+
 def get_tautulli_users(url, api_key):
     """
     Retrieve list of users from Tautulli API.
     
+    Successful responses are cached in Redis for USERS_CACHE_TTL seconds.
+    Once that expires, the cached list is revalidated with If-None-Match
+    and reused if Tautulli answers 304 Not Modified. If Redis is
+    unavailable the API is queried directly.
+    
     Args:
         url (str): The Tautulli server URL
         api_key (str): The Tautulli API key
@@ -219,27 +632,170 @@ def get_tautulli_users(url, api_key):
         list: List of user dictionaries containing user_id and friendly_name,
               or empty list if request fails
     """
+    cache_key = _users_cache_key(url, api_key)
+    cached = etag = None
+    if redis_cache is not None:
+        try:
+            cached, etag, fresh = redis_cache.mget(cache_key, f"{cache_key}:etag", f"{cache_key}:fresh")
+            if cached and fresh:
+                return orjson.loads(cached)
+        except redis.RedisError as e:
+            app.logger.warning(f"Error reading user cache: {e}")
+    
     try:
-        if not url.endswith('/'):
-            url += '/'
+        # Revalidate a stale cached list instead of downloading it again
+        headers = {'If-None-Match': etag.decode()} if cached and etag else None
         
-        api_url = f"{url}api/v2"
-        params = {
-            'apikey': api_key,
-            'cmd': 'get_user_names'
-        }
+        response = get_tautulli_client(url, api_key).get('get_user_names', headers=headers, timeout=10)
+        
+        if response.status_code == 304:
+            _store_users_cache(cache_key, cached, etag.decode())
+            return orjson.loads(cached)
         
-        response = requests.get(api_url, params=params, timeout=10)
-        data = response.json()
+        api_response = orjson.loads(response.content).get('response') or {}
         
-        if data.get('response', {}).get('result') == 'success':
-            return data.get('response', {}).get('data', [])
+        if api_response.get('result') == 'success':
+            users = api_response.get('data') or []
         else:
             return []
     
     except Exception as e:
         app.logger.error(f"Error getting users: {e}")
         return []
+    
+    _store_users_cache(cache_key, orjson.dumps(users), response.headers.get('ETag'))
+    return users
+
+def _fetch_history_page(client, params, start, length):
+    """
+    Fetch a single page of watch history from the Tautulli API.
+    
+    Args:
+        client (TautulliClient): Client for the Tautulli server
+        params (dict): History filter query parameters
+        start (int): Offset of the first record to fetch
+        length (int): Number of records to fetch
+        
+    Returns:
+        tuple: (items: list, records_filtered: int)
+        
+    Raises:
+        RuntimeError: If the API returned an error
+        requests.exceptions.RequestException: If the request failed
+    """
+    page_params = dict(params, start=start, length=length)
+    
+    response = client.get('get_history', page_params, timeout=30)
+    api_response = orjson.loads(response.content).get('response') or {}
+    
+    if api_response.get('result') != 'success':
+        raise RuntimeError(f"Tautulli API error: {api_response.get('message', 'Unknown error')}")
+    
+    page_data = api_response.get('data') or {}
+    return page_data.get('data') or [], int(page_data.get('recordsFiltered') or 0)
+
+def _iter_history_pages(client, params, start, page_size, limit):
+    """
+    Fetch history pages concurrently while yielding them in offset order.
+    
+    At most HISTORY_FETCH_WORKERS requests are in flight at once, which also
+    bounds how many pages are held in memory ahead of the consumer. If
+    Tautulli returns fewer records than requested, the rest of that page is
+    fetched from the offset where it actually ended, so no rows are skipped.
+    
+    Args:
+        client (TautulliClient): Client for the Tautulli server
+        params (dict): History filter query parameters
+        start (int): Offset of the first page to fetch
+        page_size (int): Number of records to request per page
+        limit (int): Total number of records wanted, used to size the last page
+        
+    Yields:
+        list: Page items, stopping once Tautulli returns an empty page.
+              Errors from any page are raised to the consumer.
+    """
+    offsets = iter(range(start, limit, page_size))
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=HISTORY_FETCH_WORKERS)
+    
+    def submit_next():
+        for offset in islice(offsets, 1):
+            length = min(page_size, limit - offset)
+            pending.append((offset, length,
+                            executor.submit(_fetch_history_page, client, params, offset, length)))
+    
+    try:
+        for _ in range(HISTORY_FETCH_WORKERS):
+            submit_next()
+        
+        while pending:
+            offset, length, future = pending.popleft()
+            page_items, _ = future.result()
+            if not page_items:
+                break
+            submit_next()
+            yield page_items
+            
+            # Fill in a short page before moving on to the next one
+            received = len(page_items)
+            while received < length:
+                page_items, _ = _fetch_history_page(client, params, offset + received, length - received)
+                if not page_items:
+                    return
+                yield page_items
+                received += len(page_items)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_user_history(url, api_key, user_id, start_date=None, end_date=None, media_type=None, length=25):
+    """
+    Lazily yield user watch history from Tautulli with optional filtering.
+    
+    Date and media type filters are applied by Tautulli, so every page only
+    contains matching items. The first page reports the total record count,
+    and the remaining pages are then fetched concurrently.
+    
+    Args:
+        url (str): The Tautulli server URL
+        api_key (str): The Tautulli API key
+        user_id (str): The user ID to get history for, or None for all users
+        start_date (str, optional): Start date filter in YYYY-MM-DD format
+        end_date (str, optional): End date filter in YYYY-MM-DD format
+        media_type (str, optional): Media type filter (movie, episode, track, etc.)
+        length (int, optional): Maximum number of items to yield. Defaults to 25
+        
+    Yields:
+        dict: History items with media information and watch statistics
+        
+    Raises:
+        Exception: If any request fails, including after items have been
+                   yielded, so a partial result is never mistaken for a
+                   complete one
+    """
+    client = get_tautulli_client(url, api_key)
+    params = {'user_id': user_id}
+    
+    if media_type:
+        params['media_type'] = media_type
+    
+    # Tautulli filters by date server-side (both bounds inclusive)
+    if start_date:
+        params['after'] = start_date
+    if end_date:
+        params['before'] = end_date
+    
+    # The first request doubles as a probe for the total record count
+    page_items, total = _fetch_history_page(client, params, 0, min(HISTORY_PAGE_SIZE, length))
+    if not page_items:
+        return
+    yield from page_items
+    
+    # Tautulli may cap pages below the requested size, so the first
+    # page's length sets the size of the remaining pages
+    limit = min(length, total or length)
+    page_size = len(page_items)
+    for page_items in _iter_history_pages(client, params, page_size, page_size, limit):
+        yield from page_items
 
 def get_user_history(url, api_key, user_id, start_date=None, end_date=None, media_type=None, length=25):
     """
@@ -259,116 +815,152 @@ def get_user_history(url, api_key, user_id, start_date=None, end_date=None, medi
               or empty list if request fails
     """
     try:
-        if not url.endswith('/'):
-            url += '/'
-        
-        api_url = f"{url}api/v2"
-        all_history_items = []
-        
-        # For requests larger than 1000 items, we need to paginate
-        # Tautulli typically limits responses to around 1000 items per request
-        if length > 1000:
-            # Use pagination to get large datasets
-            page_size = 1000
-            start = 0
-            
-            while len(all_history_items) < length:
-                items_to_fetch = min(page_size, length - len(all_history_items))
-                
-                params = {
-                    'apikey': api_key,
-                    'cmd': 'get_history',
-                    'user_id': user_id,
-                    'start': start,
-                    'length': items_to_fetch
-                }
-                
-                if media_type:
-                    params['media_type'] = media_type
-                
-                response = requests.get(api_url, params=params, timeout=30)
-                data = response.json()
-                
-                if data.get('response', {}).get('result') != 'success':
-                    break
-                
-                page_items = data.get('response', {}).get('data', {}).get('data', [])
-                
-                # If we got no items, we've reached the end
-                if not page_items:
-                    break
-                
-                all_history_items.extend(page_items)
-                start += len(page_items)
-                
-                # If we got fewer items than requested, we've reached the end
-                if len(page_items) < items_to_fetch:
-                    break
-            
-            history_items = all_history_items[:length]
-        else:
-            # For smaller requests, use the existing logic
-            api_length = length
-            if start_date or end_date:
-                # Get more data to ensure we have enough after filtering
-                api_length = min(length * 4, 1000)  # Get 4x requested amount, max 1000
-            
-            params = {
-                'apikey': api_key,
-                'cmd': 'get_history',
-                'user_id': user_id,
-                'length': api_length
-            }
-            
-            if media_type:
-                params['media_type'] = media_type
-            
-            response = requests.get(api_url, params=params, timeout=30)
-            data = response.json()
-            
-            if data.get('response', {}).get('result') == 'success':
-                history_items = data.get('response', {}).get('data', {}).get('data', [])
-            else:
-                return []
-        
-        # Apply server-side date filtering if dates are specified
-        if start_date or end_date:
-            filtered_items = []
-            
-            # Convert date strings to timestamps for comparison
-            start_timestamp = None
-            end_timestamp = None
-            
-            if start_date:
-                start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-                start_timestamp = int(start_dt.timestamp())
-                
-            if end_date:
-                end_dt = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1) - timedelta(seconds=1)
-                end_timestamp = int(end_dt.timestamp())
-            
-            # Filter items by date
-            for item in history_items:
-                item_date = int(item.get('date', 0))
-                
-                # Check if item falls within date range
-                if start_timestamp and item_date < start_timestamp:
-                    continue
-                if end_timestamp and item_date > end_timestamp:
-                    continue
-                    
-                filtered_items.append(item)
-            
-            # Return only the requested number of items after filtering
-            return filtered_items[:length]
-        else:
-            # No date filtering, return as requested
-            return history_items[:length]
-    
+        return list(iter_user_history(url, api_key, user_id, start_date, end_date, media_type, length))
     except Exception as e:
         app.logger.error(f"Error getting history: {e}")
         return []
 
+def parse_ymd(value):
+    """
+    Parse a date in the fixed YYYY-MM-DD format sent by the date inputs.
+    
+    Slices the fields directly instead of going through datetime.strptime,
+    which re-parses its format string on every call.
+    
+    Args:
+        value (str): The date string
+        
+    Returns:
+        datetime: Midnight on the given date
+        
+    Raises:
+        ValueError: If the value is not a valid YYYY-MM-DD date
+    """
+    if len(value) != 10 or not value.isascii() or value[4] != '-' or value[7] != '-':
+        raise ValueError(f"Invalid date: {value!r}")
+    year, month, day = value[:4], value[5:7], value[8:]
+    if not (year.isdigit() and month.isdigit() and day.isdigit()):
+        raise ValueError(f"Invalid date: {value!r}")
+    return datetime(int(year), int(month), int(day))
+
+def parse_history_filters(form):
+    """
+    Parse and validate history filter parameters from a submitted form.
+    
+    Args:
+        form (MultiDict): The request form containing user_id, start_date,
+                          end_date, media_type and length
+        
+    Returns:
+        tuple: (filters: dict, error: str or None) where filters holds the keyword
+               arguments for iter_user_history and error is a message if invalid
+    """
+    user_id = form.get('user_id')
+    start_date = form.get('start_date')
+    end_date = form.get('end_date')
+    media_type = form.get('media_type')
+    length = int(form.get('length', 25))
+    
+    # Validate export limit
+    if length > 10000:
+        return None, 'Export limit is 10,000 items maximum'
+    
+    if not user_id:
+        return None, 'User ID required'
+    
+    # Validate each date given, since Tautulli receives them as-is
+    try:
+        start_dt = parse_ymd(start_date) if start_date else None
+        end_dt = parse_ymd(end_date) if end_date else None
+    except ValueError:
+        return None, 'Invalid date format'
+    
+    if start_dt and end_dt and start_dt > end_dt:
+        return None, 'Start date must be before or equal to end date'
+    
+    return {
+        'user_id': user_id,
+        'start_date': start_date,
+        'end_date': end_date,
+        'media_type': media_type,
+        'length': length
+    }, None
+
+def csv_field(value):
+    """
+    Format a text value as a CSV field, quoting it only when required.
+    
+    Matches csv.writer's default QUOTE_MINIMAL behaviour: fields containing
+    a comma, double quote or line break are quoted, with quotes doubled.
+    
+    Args:
+        value: The field value (None is written as an empty field)
+        
+    Returns:
+        str: The escaped field
+    """
+    if value is None:
+        return ''
+    value = str(value)
+    if '"' in value or ',' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def format_timestamp(timestamp):
+    """
+    Format a Unix timestamp as local time in YYYY-MM-DD HH:MM:SS format.
+    
+    Builds the string from time.localtime fields, which is considerably
+    cheaper per row than datetime.fromtimestamp(...).strftime(...).
+    
+    Args:
+        timestamp (int): Seconds since the epoch
+        
+    Returns:
+        str: The formatted local date and time
+    """
+    t = time.localtime(timestamp)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
+def iter_csv_lines(history):
+    """
+    Convert history items into formatted CSV export lines.
+    
+    The column layout is fixed, so each line is built with one pre-compiled
+    format call instead of going through csv.writer. Only the free-text
+    columns from Tautulli (user, title, media type, IP address) can need
+    quoting. Lookups used on every row are bound to locals up front.
+    
+    Args:
+        history (iterable): History item dictionaries from the Tautulli API
+        
+    Yields:
+        str: One CSV line per item, terminated with CRLF like csv.writer
+    """
+    format_date = format_timestamp
+    format_line = CSV_LINE_FORMAT.format
+    field = csv_field
+    status_label = WATCHED_STATUS_LABELS.get
+    
+    for item in history:
+        get = item.get
+        
+        date = get('date')
+        date = format_date(int(date)) if date else ''
+        
+        title = get('title', '')
+        grandparent_title = get('grandparent_title')
+        if grandparent_title:
+            title = f"{grandparent_title} - {title}"
+        
+        duration = get('duration')
+        duration = round(int(duration) / 60, 1) if duration else 0
+        
+        status_text = status_label(int(get('watched_status', 0)), 'Unknown')
+        
+        yield format_line(date, field(get('friendly_name', '')), field(title), field(get('media_type', '')),
+                          duration, get('percent_complete', 0), status_text, field(get('ip_address', '')))
+
 # Routes
 @app.route('/')
 def index():
@@ -387,7 +979,9 @@ def index():
     if not is_logged_in():
         return redirect(url_for('login'))
     
-    user = User.query.get(session['user_id'])
+    # Read from the database so an admin password reset applies immediately;
+    # the template context reuses this user from the session identity map
+    user = get_current_user()
     if user.must_change_password:
         return redirect(url_for('change_password'))
     
@@ -418,9 +1012,19 @@ def login():
         username = request.form['username']
         password = request.form['password']
         
-        user = User.query.filter_by(username=username).first()
+        # Only the columns needed to authenticate, not a full User object
+        user = User.query.with_entities(
+            User.id, User.password_hash, User.must_change_password
+        ).filter_by(username=username).first()
         
-        if user and check_password_hash(user.password_hash, password):
+        if user and verify_password(user.password_hash, password):
+            # Upgrade legacy or outdated hashes while the plaintext is available
+            if password_needs_rehash(user.password_hash):
+                db.session.execute(
+                    update(User).where(User.id == user.id).values(password_hash=hash_password(password))
+                )
+                db.session.commit()
+            
             session['user_id'] = user.id
             session.permanent = True
             
@@ -460,14 +1064,15 @@ def change_password():
     if not is_logged_in():
         return redirect(url_for('login'))
     
-    user = User.query.get(session['user_id'])
-    forced_change = user.must_change_password
-    
     if request.method == 'POST':
+        # Load the full row (including the password hash) only when changing it
+        user = db.session.get(User, session['user_id'])
+        forced_change = user.must_change_password
+        
         # For voluntary password changes, require current password
         if not forced_change:
             current_password = request.form.get('current_password', '')
-            if not check_password_hash(user.password_hash, current_password):
+            if not verify_password(user.password_hash, current_password):
                 flash('Current password is incorrect', 'error')
                 return render_template('change_password.html', forced_change=forced_change)
         
@@ -487,7 +1092,7 @@ def change_password():
             flash('Password is too common. Please choose a stronger password.', 'error')
             return render_template('change_password.html', forced_change=forced_change)
         
-        user.password_hash = generate_password_hash(new_password)
+        user.password_hash = hash_password(new_password)
         user.must_change_password = False
         db.session.commit()
         
@@ -499,6 +1104,9 @@ def change_password():
         else:
             return redirect(url_for('index'))
     
+    # Displaying the form only needs the flag; the template context reuses this user
+    forced_change = get_current_user().must_change_password
+    
     return render_template('change_password.html', forced_change=forced_change)
 
 @app.route('/configuration', methods=['GET', 'POST'])
@@ -520,20 +1128,30 @@ def configuration():
     if not is_logged_in():
         return redirect(url_for('login'))
     
-    config = get_configuration()
-    
     if request.method == 'POST':
-        config.tautulli_url = request.form['tautulli_url'].strip()
-        config.api_key = request.form['api_key'].strip()
+        config = load_configuration()
+        tautulli_url = request.form['tautulli_url'].strip()
+        api_key = request.form['api_key'].strip()
+        
+        # Cached user lists and clients are keyed by server, so drop the old server's entries
+        if (tautulli_url, api_key) != (config.tautulli_url, config.api_key):
+            invalidate_users_cache(config.tautulli_url, config.api_key)
+            get_tautulli_client.cache_clear()
+        
+        config.tautulli_url = tautulli_url
+        config.api_key = api_key
         config.updated_at = datetime.utcnow()
         
         db.session.commit()
+        cache_configuration(config)
         flash('Configuration saved successfully!', 'success')
         return redirect(url_for('configuration'))
     
-    return render_template('configuration.html', config=config)
+    # The edit form reads the row itself so it never shows another worker's stale copy
+    return render_template('configuration.html', config=load_configuration())
 
 @app.route('/test_connection', methods=['POST'])
+@limiter.limit(RATE_LIMIT)
 def test_connection():
     """
     AJAX endpoint to test Tautulli server connection.
@@ -558,6 +1176,7 @@ def test_connection():
     return jsonify({'success': success, 'message': message})
 
 @app.route('/get_users')
+@limiter.exempt
 def get_users():
     """
     AJAX endpoint to retrieve Tautulli user list.
@@ -566,6 +1185,9 @@ def get_users():
     For non-admin users, only returns users they have permission to access.
     Returns JSON response with user data or error message.
     
+    Successful responses carry an ETag, and a matching If-None-Match
+    request gets 304 Not Modified.
+    
     Returns:
         JSON: {'success': bool, 'users': list, 'message': str} - User list or error
     """
@@ -582,18 +1204,71 @@ def get_users():
     # Get all Tautulli users
     all_users = get_tautulli_users(config.tautulli_url, config.api_key)
     
-    # Filter users based on permissions
-    if current_user.is_admin():
-        # Admin can see all users
-        filtered_users = all_users
-    else:
-        # Regular user can only see allowed users
-        allowed_usernames = current_user.get_allowed_users()
-        filtered_users = [user for user in all_users if user.get('friendly_name') in allowed_usernames]
+    response = jsonify({'success': True, 'users': filter_allowed_users(current_user, all_users)})
+    
+    # Let the browser revalidate its copy instead of downloading the list again.
+    # Flask-Compress appends the encoding to the ETag ("<hash>:br"), so compare
+    # only the part before the colon
+    response.add_etag()
+    response.headers['Cache-Control'] = 'private, no-cache'
+    etag, _ = response.get_etag()
+    for tag in request.if_none_match.as_set():
+        if tag.split(':', 1)[0] == etag:
+            not_modified = Response(status=304)
+            not_modified.set_etag(tag)
+            not_modified.headers['Cache-Control'] = response.headers['Cache-Control']
+            return not_modified
+    return response
+
+@app.route('/bootstrap')
+@limiter.limit(RATE_LIMIT)
+def bootstrap():
+    """
+    AJAX endpoint returning everything the dashboard needs on page load.
+    
+    Returns the user list and recent history in a single request. The two
+    Tautulli lookups are I/O-bound, so they run concurrently. The history
+    lookup always reaches Tautulli (the user list may come from cache), so
+    its outcome doubles as the connection status. Recent history is limited
+    to users the current user has permission to see.
     
-    return jsonify({'success': True, 'users': filtered_users})
+    Returns:
+        JSON: {'success': bool, 'users': list, 'recent': list, 'config_ok': bool,
+               'message': str} - Dashboard data or error
+    """
+    if not is_logged_in():
+        return jsonify({'success': False, 'message': 'Not logged in'})
+    
+    config = get_configuration()
+    if not config.tautulli_url or not config.api_key:
+        return jsonify({'success': False, 'config_ok': False, 'message': 'Tautulli not configured'})
+    
+    current_user = get_current_user()
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        users_future = executor.submit(get_tautulli_users, config.tautulli_url, config.api_key)
+        recent_future = executor.submit(list, iter_user_history(config.tautulli_url, config.api_key,
+                                                                None, length=RECENT_HISTORY_LENGTH))
+        
+        users = filter_allowed_users(current_user, users_future.result())
+        try:
+            recent = filter_allowed_history(current_user, recent_future.result())
+            config_ok, message = True, 'Connection successful!'
+        except Exception as e:
+            app.logger.error(f"Error getting history: {e}")
+            recent = []
+            config_ok, message = False, f"Failed to get history from Tautulli: {e}"
+    
+    return jsonify({
+        'success': True,
+        'users': users,
+        'recent': recent,
+        'config_ok': config_ok,
+        'message': message
+    })
 
 @app.route('/get_history', methods=['POST'])
+@limiter.limit(RATE_LIMIT)
 def get_history():
     """
     AJAX endpoint to retrieve filtered user history from Tautulli.
@@ -618,43 +1293,33 @@ def get_history():
     if not config.tautulli_url or not config.api_key:
         return jsonify({'success': False, 'message': 'Tautulli not configured'})
     
-    user_id = request.form.get('user_id')
-    start_date = request.form.get('start_date')
-    end_date = request.form.get('end_date')
-    media_type = request.form.get('media_type')
-    length = int(request.form.get('length', 25))
-    
-    # Validate export limit
-    if length > 10000:
-        return jsonify({'success': False, 'message': 'Export limit is 10,000 items maximum'})
+    filters, error = parse_history_filters(request.form)
+    if error:
+        return jsonify({'success': False, 'message': error})
     
-    if not user_id:
-        return jsonify({'success': False, 'message': 'User ID required'})
+    if not can_access_tautulli_user(get_current_user(), config.tautulli_url, config.api_key, filters['user_id']):
+        return jsonify({'success': False, 'message': 'Access denied for this user'})
     
-    # Validate date range
-    if start_date and end_date:
-        try:
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-            if start_dt > end_dt:
-                return jsonify({'success': False, 'message': 'Start date must be before or equal to end date'})
-        except ValueError:
-            return jsonify({'success': False, 'message': 'Invalid date format'})
-    
-    history = get_user_history(config.tautulli_url, config.api_key, user_id, start_date, end_date, media_type, length)
+    history = get_user_history(config.tautulli_url, config.api_key, **filters)
     return jsonify({'success': True, 'history': history})
 
 @app.route('/export_csv', methods=['POST'])
+@limiter.limit(RATE_LIMIT)
 def export_csv():
     """
     Export watch history data to CSV file.
     
-    Generates a CSV file from provided history data with formatted columns
-    including date, user, title, media type, duration, completion percentage,
-    status, and IP address.
+    Fetches history from Tautulli using the same filters as /get_history and
+    streams it as a CSV file with formatted columns including date, user,
+    title, media type, duration, completion percentage, status, and IP address.
+    Rows are written as each Tautulli page arrives rather than buffered.
     
-    JSON Parameters:
-        history (list): Array of history objects to export
+    Form Parameters:
+        user_id (str): Tautulli user ID (required)
+        start_date (str): Start date filter (YYYY-MM-DD format, optional)
+        end_date (str): End date filter (YYYY-MM-DD format, optional)
+        media_type (str): Media type filter (optional)
+        length (int): Number of results to export (default: 25)
         
     Returns:
         CSV file download or JSON error response
@@ -672,43 +1337,51 @@ def export_csv():
     if not is_logged_in():
         return jsonify({'success': False, 'message': 'Not logged in'})
     
-    history_data = request.json.get('history', [])
-    
-    if not history_data:
-        return jsonify({'success': False, 'message': 'No data to export'})
+    config = get_configuration()
+    if not config.tautulli_url or not config.api_key:
+        return jsonify({'success': False, 'message': 'Tautulli not configured'})
     
-    # Create CSV
-    output = StringIO()
-    writer = csv.writer(output)
+    filters, error = parse_history_filters(request.form)
+    if error:
+        return jsonify({'success': False, 'message': error})
     
-    # Headers
-    headers = ['Date', 'User', 'Title', 'Media Type', 'Duration (min)', 'Percent Complete', 'Status', 'IP Address']
-    writer.writerow(headers)
+    if not can_access_tautulli_user(get_current_user(), config.tautulli_url, config.api_key, filters['user_id']):
+        return jsonify({'success': False, 'message': 'Access denied for this user'})
     
-    # Data rows
-    for item in history_data:
-        date = datetime.fromtimestamp(int(item.get('date', 0))).strftime('%Y-%m-%d %H:%M:%S') if item.get('date') else ''
-        user = item.get('friendly_name', '')
-        title = f"{item.get('grandparent_title', '')} - {item.get('title', '')}" if item.get('grandparent_title') else item.get('title', '')
-        media_type = item.get('media_type', '')
-        duration = round(int(item.get('duration', 0)) / 60, 1) if item.get('duration') else 0
-        percent_complete = f"{item.get('percent_complete', 0)}%"
-        
-        # Format watched status
-        watched_status = int(item.get('watched_status', 0))
-        status_text = 'Finished' if watched_status == 1 else 'Stopped' if watched_status == 0 else 'Unknown'
-        
-        ip_address = item.get('ip_address', '')
-        
-        writer.writerow([date, user, title, media_type, duration, percent_complete, status_text, ip_address])
+    history_data = iter_user_history(config.tautulli_url, config.api_key, **filters)
     
-    # Create response
-    output.seek(0)
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = f'attachment; filename=tautulli_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    # Peek at the first item so an empty or failed result can still be reported as JSON
+    try:
+        first_item = next(history_data, None)
+    except Exception as e:
+        app.logger.error(f"Error getting history: {e}")
+        return jsonify({'success': False, 'message': 'Failed to get history from Tautulli'})
+    if first_item is None:
+        return jsonify({'success': False, 'message': 'No data to export'})
+    history_data = chain([first_item], history_data)
     
-    return response
+    def generate():
+        """
+        Yield the CSV in batches of lines so the download starts immediately.
+        
+        A page that fails once streaming has started is re-raised, which
+        aborts the chunked response so the client sees a failed download
+        rather than a truncated file.
+        """
+        try:
+            lines = iter_csv_lines(history_data)
+            chunk = CSV_HEADER_LINE + ''.join(islice(lines, CSV_BATCH_SIZE))
+            while chunk:
+                yield chunk
+                chunk = ''.join(islice(lines, CSV_BATCH_SIZE))
+        except Exception as e:
+            app.logger.error(f"CSV export aborted: {e}")
+            raise
+    
+    filename = f'tautulli_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    return Response(stream_with_context(generate()),
+                    mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
 
 @app.route('/logout')
 def logout():
@@ -731,7 +1404,9 @@ def health_check():
     Health check endpoint for application monitoring.
     
     Tests database connectivity and returns application status.
-    Exempt from rate limiting for monitoring systems.
+    Exempt from rate limiting for monitoring systems. A successful
+    database check is reused for HEALTH_CHECK_INTERVAL seconds so frequent
+    probes do not each open a connection.
     
     Returns:
         JSON: Status information with HTTP 200 (healthy) or 503 (unhealthy)
@@ -744,49 +1419,33 @@ def health_check():
             'error': Error message (if unhealthy)
         }
     """
+    global _last_health_ok
+    
     try:
-        # Test database connection
-        db.session.execute(text('SELECT 1'))
-        return jsonify({
+        # Test database connection on a raw engine connection, at most once
+        # per HEALTH_CHECK_INTERVAL since the last successful check
+        now = time.monotonic()
+        if now - _last_health_ok >= HEALTH_CHECK_INTERVAL:
+            with db.engine.connect() as conn:
+                conn.exec_driver_sql('SELECT 1')
+            _last_health_ok = now
+        response = jsonify({
             'status': 'healthy',
             'timestamp': datetime.utcnow().isoformat(),
             'version': '1.0.0'
-        }), 200
+        })
+        status = 200
     except Exception as e:
         app.logger.error(f'Health check failed: {str(e)}')
-        return jsonify({
+        response = jsonify({
             'status': 'unhealthy',
             'error': 'Database connection failed',
             'timestamp': datetime.utcnow().isoformat()
-        }), 503
-
-# Security headers for all responses
-@app.after_request
-def set_security_headers(response):
-    """
-    Add security headers to all HTTP responses.
+        })
+        status = 503
     
-    Applies standard security headers to enhance application security
-    unless disabled via SECURITY_HEADERS environment variable.
-    
-    Args:
-        response (Flask.Response): The response object to modify
-        
-    Returns:
-        Flask.Response: Modified response with security headers
-        
-    Headers Added:
-        - X-Content-Type-Options: nosniff
-        - X-Frame-Options: DENY
-        - X-XSS-Protection: 1; mode=block
-        - Referrer-Policy: strict-origin-when-cross-origin
-    """
-    if os.environ.get('SECURITY_HEADERS', 'true').lower() == 'true':
-        response.headers['X-Content-Type-Options'] = 'nosniff'
-        response.headers['X-Frame-Options'] = 'DENY'
-        response.headers['X-XSS-Protection'] = '1; mode=block'
-        response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-    return response
+    response.headers['Cache-Control'] = 'no-store'
+    return response, status
 
 # Error handlers
 @app.errorhandler(404)
@@ -839,6 +1498,48 @@ def ratelimit_handler(e):
                          message='Too many requests. Please wait before trying again.'), 429
 
 # Initialize database and create default user
+# Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING
+_CONFLICT_SAFE_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+def create_default_admin():
+    """
+    Create the default admin user if no users exist yet.
+    
+    Issues a single INSERT ... SELECT ... WHERE NOT EXISTS statement instead
+    of a read followed by an insert. On PostgreSQL and SQLite it also adds
+    ON CONFLICT (username) DO NOTHING, so workers starting simultaneously
+    cannot race each other. Must be called inside an application context.
+    
+    Returns:
+        bool: True if the default admin user was created
+    """
+    users = User.__table__
+    defaults = select(
+        literal('admin'),
+        literal(hash_password('admin')),
+        literal('admin'),
+        literal(True, db.Boolean),
+        literal(True, db.Boolean),
+        literal('[]'),
+        literal(datetime.utcnow(), db.DateTime)
+    ).where(~select(users.c.id).exists())
+    
+    dialect = db.engine.dialect.name
+    stmt = _CONFLICT_SAFE_INSERTS.get(dialect, insert)(users).from_select(
+        ['username', 'password_hash', 'role', 'must_change_password',
+         'is_active', 'allowed_tautulli_users', 'created_at'],
+        defaults
+    )
+    if dialect in _CONFLICT_SAFE_INSERTS:
+        stmt = stmt.on_conflict_do_nothing(index_elements=['username'])
+    
+    result = db.session.execute(stmt)
+    db.session.commit()
+    return result.rowcount > 0
+
 def create_tables():
     """
     Initialize database tables and create default admin user.
@@ -853,17 +1554,7 @@ def create_tables():
     """
     with app.app_context():
         db.create_all()
-        
-        # Create default admin user if none exists
-        if not User.query.first():
-            default_user = User(
-                username='admin',
-                password_hash=generate_password_hash('admin'),
-                role='admin',
-                must_change_password=True
-            )
-            db.session.add(default_user)
-            db.session.commit()
+        create_default_admin()
 
 @app.route('/user_management')
 @require_admin
@@ -905,7 +1596,7 @@ def add_user():
         # Create new user
         user = User(
             username=username,
-            password_hash=generate_password_hash(password),
+            password_hash=hash_password(password),
             role=role,
             is_active=is_active,
             must_change_password=True
@@ -943,7 +1634,7 @@ def edit_user():
         reset_password = 'reset_password' in request.form
         allowed_users = request.form.getlist('allowed_users')
         
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             flash('User not found.', 'error')
             return redirect(url_for('user_management'))
@@ -989,7 +1680,7 @@ def delete_user():
     """
     try:
         user_id = request.form.get('user_id')
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         
         if not user:
             flash('User not found.', 'error')
@@ -1015,32 +1706,35 @@ def delete_user():
     return redirect(url_for('user_management'))
 
 @app.route('/api/tautulli_users')
+@limiter.limit(RATE_LIMIT)
 def api_tautulli_users():
     """
     API endpoint to get list of Tautulli users for user management.
     
+    Restricted to admins, since it queries Tautulli with the stored API key.
+    
     Returns:
         JSON: List of Tautulli users or error message
     """
+    if not is_logged_in():
+        return jsonify({'error': 'Not logged in'})
+    
+    current_user = get_current_user()
+    if not current_user or not current_user.is_admin():
+        return jsonify({'error': 'Admin access required'})
+    
     try:
         config = get_configuration()
         if not config.tautulli_url or not config.api_key:
             return jsonify({'error': 'Tautulli not configured'})
         
         # Get users from Tautulli API
-        response = requests.get(
-            f"{config.tautulli_url}/api/v2",
-            params={
-                'apikey': config.api_key,
-                'cmd': 'get_users'
-            },
-            timeout=10
-        )
+        response = get_tautulli_client(config.tautulli_url, config.api_key).get('get_users', timeout=10)
         response.raise_for_status()
         
-        data = response.json()
-        if data.get('response', {}).get('result') == 'success':
-            users = data.get('response', {}).get('data', [])
+        api_response = orjson.loads(response.content).get('response') or {}
+        if api_response.get('result') == 'success':
+            users = api_response.get('data') or []
             return jsonify({'users': users})
         else:
             return jsonify({'error': 'Failed to get users from Tautulli'})
@@ -5,8 +5,7 @@ Initialization script for Tautulli History Exporter
 
 import os
 import sys
-from app import app, db, User
-from werkzeug.security import generate_password_hash
+from app import app, db, create_default_admin
 
 def init_app():
     """Initialize the application database and create default user"""
@@ -15,15 +14,7 @@ def init_app():
         db.create_all()
         
         # Create default admin user if none exists
-        if not User.query.first():
-            print("Creating default admin user...")
-            default_user = User(
-                username='admin',
-                password_hash=generate_password_hash('admin'),
-                must_change_password=True
-            )
-            db.session.add(default_user)
-            db.session.commit()
+        if create_default_admin():
             print("Default user created: admin/admin")
         else:
             print("Admin user already exists")
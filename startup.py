@@ -6,8 +6,7 @@ Production startup script with validation and monitoring
 import os
 import sys
 import logging
-from app import app, db, User
-from werkzeug.security import generate_password_hash
+from app import app, db, User, create_default_admin
 
 # Configure logging
 logging.basicConfig(
@@ -82,20 +81,11 @@ def init_database():
             db.create_all()
             
             # Create default admin user if none exists
-            if not User.query.first():
-                logger.info("Creating default admin user...")
-                default_user = User(
-                    username='admin',
-                    password_hash=generate_password_hash('admin'),
-                    role='admin',
-                    must_change_password=True
-                )
-                db.session.add(default_user)
-                db.session.commit()
+            if create_default_admin():
                 logger.info("Default admin user created (admin/admin)")
                 logger.warning("SECURITY: Please change the default password immediately!")
             else:
-                admin_user = User.query.filter_by(username='admin').first()
+                admin_user = User.query.with_entities(User.must_change_password).filter_by(username='admin').first()
                 if admin_user:
                     logger.info(f"Admin user exists, must_change_password: {admin_user.must_change_password}")
                 else: